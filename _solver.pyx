@@ -0,0 +1,218 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+This module is a compiled version of solver_core.propagate.
+
+It is for deploys that can't wait for numba to compile on the first request. Build it with:
+
+    python setup.py build_ext --inplace
+
+sudoku_solver uses it when it can be imported and falls back to solver_core otherwise. The
+reduction runs without the GIL, so other Flask requests keep running while a puzzle is solved.
+"""
+
+# Units are rows, columns and boxes, so there are never more than 27.
+cdef enum:
+    MAX_UNITS = 27
+
+
+cdef inline int count_bits(unsigned int mask) noexcept nogil:
+    cdef int count = 0
+    while mask:
+        mask &= mask - 1
+        count += 1
+    return count
+
+
+cdef inline void mark_dirty(int cell, const short* cell_units, int units_per_cell,
+                            char* dirty) noexcept nogil:
+    cdef int j
+    for j in range(cell * units_per_cell, cell * units_per_cell + units_per_cell):
+        dirty[cell_units[j]] = 1
+
+
+cdef int hidden_singles(unsigned short* possibilities, const short* units, int unit,
+                        const short* cell_units, int units_per_cell, char* dirty,
+                        int* queue, int* tail) noexcept nogil:
+    # Digits seen at least once and more than once among unsolved cells.
+    cdef unsigned int once = 0
+    cdef unsigned int twice = 0
+    cdef unsigned int solved = 0
+    cdef unsigned int unique, mask, hit
+    cdef int k, cell
+    cdef int removed = 0
+
+    for k in range(unit * 9, unit * 9 + 9):
+        mask = possibilities[units[k]]
+        if mask & (mask - 1):
+            twice |= once & mask
+            once |= mask
+        else:
+            solved |= mask
+
+    unique = once & ~twice & ~solved
+    if unique == 0:
+        return removed
+
+    for k in range(unit * 9, unit * 9 + 9):
+        cell = units[k]
+        mask = possibilities[cell]
+        if mask & (mask - 1) and mask & unique:
+            # If a cell holds more than one unique digit, keep the lowest.
+            hit = mask & unique
+            possibilities[cell] = <unsigned short>(hit & (~hit + 1))
+            removed += count_bits(mask) - 1
+            mark_dirty(cell, cell_units, units_per_cell, dirty)
+            queue[tail[0]] = cell
+            tail[0] += 1
+    return removed
+
+
+cdef int eliminate_subset(unsigned short* possibilities, const short* units, int unit,
+                          unsigned int subset, const short* cell_units, int units_per_cell,
+                          char* dirty, int* queue, int* tail) noexcept nogil:
+    cdef unsigned int mask
+    cdef int j, cell
+    cdef int members = 0
+    cdef int removed = 0
+
+    # Count the unsolved cells holding only digits of the subset.
+    for j in range(unit * 9, unit * 9 + 9):
+        mask = possibilities[units[j]]
+        if mask & (mask - 1) and mask & ~subset == 0:
+            members += 1
+    if members != count_bits(subset):
+        return removed
+
+    for j in range(unit * 9, unit * 9 + 9):
+        cell = units[j]
+        mask = possibilities[cell]
+        if mask & (mask - 1) and mask & ~subset and mask & subset:
+            removed += count_bits(mask & subset)
+            mask &= ~subset
+            possibilities[cell] = <unsigned short>mask
+            mark_dirty(cell, cell_units, units_per_cell, dirty)
+            if mask & (mask - 1) == 0:
+                queue[tail[0]] = cell
+                tail[0] += 1
+    return removed
+
+
+cdef int naked_subsets(unsigned short* possibilities, const short* units, int unit,
+                       const short* cell_units, int units_per_cell, char* dirty,
+                       int* queue, int* tail) noexcept nogil:
+    cdef unsigned int first, second, third, pair
+    cdef int a, b, c, size
+    cdef int removed = 0
+
+    # The digits tried are the unions of 2 or 3 unsolved cells.
+    for a in range(unit * 9, unit * 9 + 9):
+        first = possibilities[units[a]]
+        if first & (first - 1) == 0 or count_bits(first) > 3:
+            continue
+
+        for b in range(a + 1, unit * 9 + 9):
+            second = possibilities[units[b]]
+            if second & (second - 1) == 0:
+                continue
+            pair = first | second
+            size = count_bits(pair)
+            if size == 2:
+                removed += eliminate_subset(possibilities, units, unit, pair, cell_units,
+                                            units_per_cell, dirty, queue, tail)
+            elif size == 3:
+                for c in range(b + 1, unit * 9 + 9):
+                    third = possibilities[units[c]]
+                    if third & (third - 1) and third & ~pair == 0:
+                        removed += eliminate_subset(possibilities, units, unit, pair, cell_units,
+                                                    units_per_cell, dirty, queue, tail)
+                        break
+    return removed
+
+
+cdef int _propagate(unsigned short* possibilities, const short* peers, const short* units,
+                    int unit_count, const short* cell_units, int units_per_cell) noexcept nogil:
+    # A cell is queued once, when it becomes solved, so 81 slots are enough.
+    cdef int queue[81]
+    cdef char dirty[MAX_UNITS]
+    cdef int head = 0
+    cdef int tail = 0
+    cdef int removed = 0
+    cdef int i, k, peer, unit
+    cdef unsigned int mask, digit
+
+    for i in range(81):
+        mask = possibilities[i]
+        if mask != 0 and mask & (mask - 1) == 0:
+            queue[tail] = i
+            tail += 1
+
+    for unit in range(unit_count):
+        dirty[unit] = 1
+
+    while True:
+        while head < tail:
+            i = queue[head]
+            head += 1
+            digit = possibilities[i]
+            for k in range(i * 20, i * 20 + 20):
+                peer = peers[k]
+                mask = possibilities[peer]
+                if mask & (mask - 1) and mask & digit:
+                    mask &= ~digit
+                    possibilities[peer] = <unsigned short>mask
+                    removed += 1
+                    mark_dirty(peer, cell_units, units_per_cell, dirty)
+                    if mask & (mask - 1) == 0:
+                        queue[tail] = peer
+                        tail += 1
+
+        unit = 0
+        while unit < unit_count and not dirty[unit]:
+            unit += 1
+        if unit == unit_count:
+            return removed
+        dirty[unit] = 0
+
+        removed += hidden_singles(possibilities, units, unit, cell_units, units_per_cell, dirty,
+                                  queue, &tail)
+        removed += naked_subsets(possibilities, units, unit, cell_units, units_per_cell, dirty,
+                                 queue, &tail)
+
+
+def propagate(unsigned short[::1] possibilities, const short[::1] peers, const short[::1] units,
+              const short[::1] cell_units) -> int:
+    """
+    Reduces the candidate masks until nothing changes. Same as solver_core.propagate.
+
+    param possibilities: array('H') of 81 candidate masks. Updated in place.
+    param peers: array('h'). Flat table of the 20 peers of each cell.
+    param units: array('h'). Flat table of up to 27 units, 9 entries per unit.
+    param cell_units: array('h'). Flat table of the unit numbers each cell belongs to.
+
+    Returns: int. The number of candidates removed.
+    """
+    cdef int unit_count = units.shape[0] // 9
+    cdef int units_per_cell = cell_units.shape[0] // 81
+    cdef int removed
+    cdef Py_ssize_t k
+
+    if possibilities.shape[0] != 81 or peers.shape[0] != 81 * 20:
+        raise ValueError('Expected 81 cells with 20 peers each.')
+    if unit_count == 0 or unit_count > MAX_UNITS or units_per_cell == 0:
+        raise ValueError('Expected between 1 and 27 units, with every cell in at least one.')
+
+    # Bounds checking is off, so check every index once here rather than on each access.
+    for k in range(peers.shape[0]):
+        if peers[k] < 0 or peers[k] >= 81:
+            raise ValueError('Peer table entries must be cell indexes from 0 to 80.')
+    for k in range(unit_count * 9):
+        if units[k] < 0 or units[k] >= 81:
+            raise ValueError('Unit table entries must be cell indexes from 0 to 80.')
+    for k in range(units_per_cell * 81):
+        if cell_units[k] < 0 or cell_units[k] >= unit_count:
+            raise ValueError('Cell unit table entries must be unit numbers in the unit table.')
+
+    with nogil:
+        removed = _propagate(&possibilities[0], &peers[0], &units[0], unit_count,
+                             &cell_units[0], units_per_cell)
+    return removed
@@ -0,0 +1,15 @@
+"""
+Builds the optional compiled propagation module, _solver, in place:
+
+    python setup.py build_ext --inplace
+
+The app runs without it, using solver_core instead.
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name='sudoku',
+    ext_modules=cythonize('_solver.pyx'),
+)
@@ -0,0 +1,324 @@
+"""
+This module has the numerical core of the sudoku solver.
+
+solver_core.propagate
+    Reduces an array of candidate masks to a fixed point.
+
+solver_core.search
+    Solves an array of candidate masks by guessing, backing out of contradictions.
+
+The functions here only use integers and flat index tables so numba can compile them. If numba
+isn't installed they run as plain Python.
+"""
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """
+        Stand-in for numba.njit when numba isn't installed. Returns the function unchanged.
+        """
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+
+# All candidates possible. Masks are read as 'possibilities[i] & FULL' rather than with int():
+# under numba that gives an int64 instead of the array's uint16, so later bit operations don't mix
+# unsigned and signed types, which numba would turn into floats.
+FULL = 0x1FF
+
+
+@njit(cache=True)
+def count_bits(mask) -> int:
+    """
+    Count the number of candidates in a mask.
+
+    param mask: int. 9-bit candidate mask. Only the low 9 bits are counted.
+
+    Returns: int.
+    """
+    # Narrow to 9 bits as an int64 first, whatever integer type numba passed in.
+    mask = mask & FULL
+    count = 0
+    while mask:
+        mask &= mask - 1
+        count += 1
+    return count
+
+
+@njit(cache=True)
+def mark_dirty(cell, cell_units, dirty) -> None:
+    """
+    Marks every unit holding a changed cell so it is searched again.
+
+    param cell: int. Index of the changed cell.
+    param cell_units: flat table of the unit numbers each cell belongs to.
+    param dirty: list (of bools). One flag per unit. Updated in place.
+
+    Returns: None.
+    """
+    units_per_cell = len(cell_units) // 81
+    for j in range(cell * units_per_cell, cell * units_per_cell + units_per_cell):
+        dirty[cell_units[j]] = True
+
+
+@njit(cache=True)
+def hidden_singles(possibilities, units, unit, cell_units, dirty, queue, tail) -> tuple:
+    """
+    Solves any cell that is the only place left in a unit for a digit.
+
+    param possibilities: 81 candidate masks. Updated in place.
+    param units: flat table of units, 9 entries per unit.
+    param unit: int. Number of the unit to search.
+    param cell_units: flat table of the unit numbers each cell belongs to.
+    param dirty: list (of bools). Units of solved cells are marked.
+    param queue: list (of ints). Solved cells are appended at tail.
+    param tail: int. Number of cells queued so far.
+
+    Returns: tuple. The new tail of the queue and the number of candidates removed.
+    """
+    # Digits seen at least once and more than once among unsolved cells.
+    once = 0
+    twice = 0
+    solved = 0
+    for k in range(unit * 9, unit * 9 + 9):
+        mask = possibilities[units[k]] & FULL
+        if mask & (mask - 1):
+            twice |= once & mask
+            once |= mask
+        else:
+            solved |= mask
+
+    unique = once & ~twice & ~solved
+    removed = 0
+    if unique == 0:
+        return tail, removed
+
+    for k in range(unit * 9, unit * 9 + 9):
+        cell = units[k]
+        mask = possibilities[cell] & FULL
+        if mask & (mask - 1) and mask & unique:
+            # If a cell holds more than one unique digit, keep the lowest.
+            hit = mask & unique
+            possibilities[cell] = hit & (~hit + 1)
+            removed += count_bits(mask) - 1
+            mark_dirty(cell, cell_units, dirty)
+            queue[tail] = cell
+            tail += 1
+    return tail, removed
+
+
+@njit(cache=True)
+def eliminate_subset(possibilities, units, unit, subset, cell_units, dirty, queue, tail) -> tuple:
+    """
+    Removes the digits of subset from a unit's other cells if exactly as many unsolved cells as
+    there are digits in subset hold only those digits.
+
+    param subset: int. Candidate mask of 2 or 3 digits.
+
+    Takes the other parameters as hidden_singles.
+
+    Returns: tuple. The new tail of the queue and the number of candidates removed.
+    """
+    # Count the unsolved cells holding only digits of the subset.
+    members = 0
+    for j in range(unit * 9, unit * 9 + 9):
+        mask = possibilities[units[j]] & FULL
+        if mask & (mask - 1) and mask & ~subset == 0:
+            members += 1
+    removed = 0
+    if members != count_bits(subset):
+        return tail, removed
+
+    for j in range(unit * 9, unit * 9 + 9):
+        cell = units[j]
+        mask = possibilities[cell] & FULL
+        if mask & (mask - 1) and mask & ~subset and mask & subset:
+            removed += count_bits(mask & subset)
+            mask &= ~subset
+            possibilities[cell] = mask
+            mark_dirty(cell, cell_units, dirty)
+            if mask & (mask - 1) == 0:
+                queue[tail] = cell
+                tail += 1
+    return tail, removed
+
+
+@njit(cache=True)
+def naked_subsets(possibilities, units, unit, cell_units, dirty, queue, tail) -> tuple:
+    """
+    Finds naked pairs and triples in a unit: k unsolved cells whose candidates all fall within the
+    same k digits. Those digits are removed from every other cell in the unit.
+
+    The digits tried are the unions of 2 or 3 unsolved cells, so triples like {12}{23}{13}, where
+    no cell holds all three digits, are found too.
+
+    Takes the same parameters as hidden_singles.
+
+    Returns: tuple. The new tail of the queue and the number of candidates removed.
+    """
+    removed = 0
+    for a in range(unit * 9, unit * 9 + 9):
+        first = possibilities[units[a]] & FULL
+        if first & (first - 1) == 0 or count_bits(first) > 3:
+            continue
+
+        for b in range(a + 1, unit * 9 + 9):
+            second = possibilities[units[b]] & FULL
+            if second & (second - 1) == 0:
+                continue
+            pair = first | second
+            size = count_bits(pair)
+            if size == 2:
+                tail, count = eliminate_subset(possibilities, units, unit, pair, cell_units, dirty,
+                                               queue, tail)
+                removed += count
+            elif size == 3:
+                for c in range(b + 1, unit * 9 + 9):
+                    third = possibilities[units[c]] & FULL
+                    if third & (third - 1) and third & ~pair == 0:
+                        tail, count = eliminate_subset(possibilities, units, unit, pair,
+                                                       cell_units, dirty, queue, tail)
+                        removed += count
+                        break
+    return tail, removed
+
+
+@njit(cache=True)
+def propagate(possibilities, peers, units, cell_units) -> int:
+    """
+    Reduces the candidate masks until nothing changes.
+
+    Every solved cell removes its digit from its unsolved peers. When no solved cells are left to
+    process, units with a changed cell are searched for a digit that only one cell can hold, and
+    for naked pairs and triples.
+
+    param possibilities: 81 candidate masks, bit d-1 set if digit d is possible. Updated in place.
+    param peers: flat table of the 20 peers of each cell, 20 entries per cell.
+    param units: flat table of the units to search, 9 entries per unit.
+    param cell_units: flat table of the unit numbers each cell belongs to, the same count per cell.
+
+    Returns: int. The number of candidates removed, so callers can keep a running count.
+    """
+    unit_count = len(units) // 9
+    removed = 0
+
+    # A cell is queued once, when it becomes solved, so 81 slots are enough.
+    queue = [0] * 81
+    head = 0
+    tail = 0
+    for i in range(81):
+        mask = possibilities[i] & FULL
+        if mask != 0 and mask & (mask - 1) == 0:
+            queue[tail] = i
+            tail += 1
+
+    dirty = [True] * unit_count
+    while True:
+        while head < tail:
+            i = queue[head]
+            head += 1
+            digit = possibilities[i] & FULL
+            for k in range(i * 20, i * 20 + 20):
+                peer = peers[k]
+                mask = possibilities[peer] & FULL
+                if mask & (mask - 1) and mask & digit:
+                    mask &= ~digit
+                    possibilities[peer] = mask
+                    removed += 1
+                    mark_dirty(peer, cell_units, dirty)
+                    if mask & (mask - 1) == 0:
+                        queue[tail] = peer
+                        tail += 1
+
+        unit = 0
+        while unit < unit_count and not dirty[unit]:
+            unit += 1
+        if unit == unit_count:
+            return removed
+        dirty[unit] = False
+
+        tail, count = hidden_singles(possibilities, units, unit, cell_units, dirty, queue, tail)
+        removed += count
+        tail, count = naked_subsets(possibilities, units, unit, cell_units, dirty, queue, tail)
+        removed += count
+
+
+@njit(cache=True)
+def is_consistent(possibilities, units) -> bool:
+    """
+    Checks that no unit has two cells solved with the same digit or a digit with no cell left.
+
+    param possibilities: 81 candidate masks.
+    param units: flat table of units, 9 entries per unit.
+
+    Returns: bool. False if the candidates have reached a contradiction.
+    """
+    for unit in range(len(units) // 9):
+        seen = 0
+        solved = 0
+        for k in range(unit * 9, unit * 9 + 9):
+            mask = possibilities[units[k]] & FULL
+            if mask & (mask - 1) == 0:
+                if solved & mask or mask == 0:
+                    return False
+                solved |= mask
+            seen |= mask
+        if seen != FULL:
+            return False
+    return True
+
+
+@njit(cache=True)
+def search(possibilities, peers, units, cell_units) -> bool:
+    """
+    Solves the puzzle by guessing when propagation gets stuck, undoing guesses that lead to a
+    contradiction.
+
+    Guesses are made in the unsolved cell with the fewest candidates, trying its digits from lowest
+    to highest. Uses an explicit stack instead of recursion so numba can compile it.
+
+    Takes the same parameters as propagate.
+
+    Returns: bool. True with possibilities holding the solution, or False if there isn't one.
+    """
+    # Each guess solves a cell, so there are at most 81 guesses on the stack.
+    saved = [0] * (81 * 81)
+    guess_cell = [0] * 81
+    untried = [0] * 81
+    depth = 0
+
+    propagate(possibilities, peers, units, cell_units)
+    while True:
+        if is_consistent(possibilities, units):
+            # Find the unsolved cell with the fewest candidates.
+            cell = -1
+            fewest = 10
+            for i in range(81):
+                size = count_bits(possibilities[i] & FULL)
+                if 1 < size < fewest:
+                    cell = i
+                    fewest = size
+            if cell == -1:
+                return True
+
+            for i in range(81):
+                saved[depth * 81 + i] = possibilities[i]
+            guess_cell[depth] = cell
+            untried[depth] = possibilities[cell] & FULL
+            depth += 1
+
+        # Try the next digit of the deepest guess that has any left.
+        while depth > 0 and untried[depth - 1] == 0:
+            depth -= 1
+        if depth == 0:
+            return False
+
+        for i in range(81):
+            possibilities[i] = saved[(depth - 1) * 81 + i]
+        remaining = untried[depth - 1]
+        digit = remaining & (~remaining + 1)
+        untried[depth - 1] = remaining & ~digit
+        possibilities[guess_cell[depth - 1]] = digit
+        propagate(possibilities, peers, units, cell_units)
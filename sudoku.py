@@ -1,3 +1,5 @@
+import functools
+
 from flask import Flask, render_template
 
 from flask_bootstrap import Bootstrap
@@ -19,10 +21,28 @@ class SudokuForm(FlaskForm):
     submit = SubmitField('Submit')
 
 
-@app.route('/')
-def index():
-    name = None
-    numbers = sudoku_solver.BLANK_PUZZLE
+@functools.lru_cache(maxsize=1024)
+def solve_puzzle(canonical_puzzle: str) -> tuple:
+    """
+    Solves a puzzle as far as SudokuSolver can, remembering recent puzzles so resubmitting one
+    doesn't solve it again.
+
+    param canonical_puzzle: str. Puzzle from sudoku_solver.canonicalize.
+
+    Returns: tuple. The possibilities formatted for the web, and the reduced puzzle string.
+    """
+    my_puzzle = sudoku_solver.SudokuSolver(puzzle_string = canonical_puzzle)
+    return tuple(my_puzzle.get_possibilities_for_web()), my_puzzle.get_reduced_puzzle()
+
+
+@functools.lru_cache(maxsize=None)
+def render_index() -> str:
+    """
+    Renders the home page. The page never changes, so it is only rendered once.
+
+    Returns: str. The page's HTML.
+    """
+    numbers = list(sudoku_solver.BLANK_PUZZLE)
     numbers[38] = '1'
     numbers[51] = '2'
     numbers[66] = '8'
@@ -30,13 +50,17 @@ def index():
     return render_template('index.html', numbers=numbers)
 
 
+@app.route('/')
+def index():
+    return render_index()
+
+
 @app.route('/solve_helper', methods=['GET', 'POST'])
 def solve_helper():
     form = SudokuForm()
     if form.validate_on_submit():
-        my_puzzle = sudoku_solver.SudokuSolver(puzzle_string = form.sudoku_puzzle.data)
-        puzzle_solution = my_puzzle.get_possibilities_for_web() # TODO: make new function to make possibilities pretty
-        reduced_puzzle = my_puzzle.get_reduced_puzzle()
+        canonical_puzzle = sudoku_solver.canonicalize(form.sudoku_puzzle.data)
+        puzzle_solution, reduced_puzzle = solve_puzzle(canonical_puzzle)
         return render_template('solved.html', numbers=puzzle_solution, reduced_puzzle=reduced_puzzle)
     name = None
     numbers = [i for i in range(0, 81)]
@@ -10,8 +10,117 @@ sudoku_solver.BacktrackSolver
 
 import string
 import copy
+from array import array
+from typing import Final, Optional
+
+import solver_core
+try:
+    # Compiled version of solver_core.propagate, built with setup.py for deploys.
+    import _solver as propagation
+except ImportError:
+    propagation = solver_core
+
+BLANK_PUZZLE: Final = ('\n\n\n',) * 81
+
+# Puzzle strings are read with newlines dropped (HTML form newlines aren't \n, they are \r) and
+# anything that isn't a digit from 1 to 9 taken as a blank cell. This maps every byte to itself if
+# it's 1-9 and to '.' otherwise.
+CELL_TABLE: Final = bytes(b if 0x31 <= b <= 0x39 else 0x2E for b in range(256))
+# Maps the characters of a canonical puzzle to cell values: 1-9 for digits and 0 for blanks.
+VALUE_TABLE: Final = bytes(b - 0x30 if 0x31 <= b <= 0x39 else 0 for b in range(256))
+# Printable character of each cell value.
+VALUE_CHARS: Final = ' 123456789'
+# Printable grid with a {} slot for each of the 81 cells and the box borders filled in.
+GRID_TEMPLATE: Final = (' --- --- ---\n' + ('|{}{}{}' * 3 + '|\n') * 3) * 3 + ' --- --- ---'
+
+
+def canonicalize(puzzle_string) -> str:
+    """
+    Get the standard encoding of a puzzle string: 81 characters, digits for givens and '.' for
+    blank cells. Puzzles that read the same have the same encoding.
+
+    param puzzle_string: str. Puzzle in any format SudokuSolver accepts.
+
+    Returns: str.
+    """
+    # Non-ASCII characters become '?', so each still takes up one blank cell.
+    cells = puzzle_string.encode('ascii', 'replace').translate(CELL_TABLE, b'\n\r')[:81]
+    return cells.decode('ascii').ljust(81, '.')
+
+
+# Candidates for a cell are stored as a 9-bit mask. Bit d-1 set means digit d is still possible.
+FULL: Final = 0x1FF
+
+# Digit characters and the candidate bit of each.
+DIGITS: Final = tuple('123456789')
+DIGIT_BIT: Final = tuple(1 << i for i in range(9))
+# Digit character of every candidate mask: the digit for solved masks, '.' for the rest.
+DIGIT: Final = tuple(
+    DIGITS[mask.bit_length() - 1] if mask and not mask & (mask - 1) else '.'
+    for mask in range(FULL + 1)
+)
+# Candidate bit of each cell value, with 0 (blank) having none.
+VALUE_BIT: Final = (0,) + DIGIT_BIT
+# Hints for every candidate mask, laid out like a keypad ('123\n456\n789') with a space in place
+# of each digit that isn't possible.
+HINT_GRID: Final = tuple(
+    '\n'.join(
+        ''.join(DIGITS[i] if mask & (1 << i) else ' ' for i in range(row, row + 3))
+        for row in (0, 3, 6)
+    )
+    for mask in range(FULL + 1)
+)
+
+# Cell indexes of every row, column and box, built once at import.
+ROW_IDX: Final = tuple(tuple(range(r * 9, r * 9 + 9)) for r in range(9))
+COL_IDX: Final = tuple(tuple(range(c, 81, 9)) for c in range(9))
+BOX_IDX: Final = tuple(
+    tuple((r * 3 + i) * 9 + (c * 3 + j) for i in range(3) for j in range(3))
+    for r in range(3) for c in range(3)
+)
+# Index of the upper left cell of each box.
+BOX_START: Final = tuple(box[0] for box in BOX_IDX)
+# Every row, column and box, numbered in that order.
+ALL_UNITS: Final = ROW_IDX + COL_IDX + BOX_IDX
+# Box number of each cell.
+CELL_BOX: Final = tuple((i // 27) * 3 + (i % 9) // 3 for i in range(81))
+# Numbers in ALL_UNITS of the row, column and box of each cell.
+CELL_UNITS: Final = tuple((i // 9, 9 + i % 9, 18 + CELL_BOX[i]) for i in range(81))
+# The 20 cells sharing a row, column or box with each cell.
+PEERS: Final = tuple(
+    tuple(sorted(set(ROW_IDX[i // 9] + COL_IDX[i % 9] + BOX_IDX[CELL_BOX[i]]) - {i}))
+    for i in range(81)
+)
+
+# Flat copies of the tables for solver_core, as read-only views of 16-bit integer arrays.
+PEERS_FLAT: Final = memoryview(array('h', [peer for peers in PEERS for peer in peers])).toreadonly()
+UNITS_FLAT: Final = memoryview(array('h', [i for unit in ALL_UNITS for i in unit])).toreadonly()
+CELL_UNITS_FLAT: Final = memoryview(
+    array('h', [unit for units in CELL_UNITS for unit in units])
+).toreadonly()
+
+
+def is_solved(mask) -> bool:
+    """
+    Checks if a candidate mask has exactly one digit left.
+
+    param mask: int. 9-bit candidate mask.
+
+    Returns: bool. True if exactly one bit is set.
+    """
+    return mask != 0 and mask & (mask - 1) == 0
+
+
+def mask_to_digits(mask) -> list:
+    """
+    Get the digits in a candidate mask.
+
+    param mask: int. 9-bit candidate mask.
+
+    Returns: list (of strings). The digits, in ascending order.
+    """
+    return [digit for digit, bit in zip(DIGITS, DIGIT_BIT) if mask & bit]
 
-BLANK_PUZZLE = ['\n\n\n' for i in range(0,81)]
 
 class SudokuSolver:
     """
@@ -26,6 +135,9 @@ class SudokuSolver:
     '123...456........................................................................'
     """
 
+    # A fixed set of attributes keeps instances small and attribute access fast.
+    __slots__ = ('puzzle_array', 'puzzle_string', 'possibilities', 'total')
+
     def __init__(self, **kwargs):
         """
         Creates SudokuSolver class.
@@ -37,20 +149,9 @@ class SudokuSolver:
         """
         if 'puzzle_string' in kwargs: 
             puzzle_string = kwargs['puzzle_string']
-            puzzle_array = []
-            processor = 0
-            while processor < len(puzzle_string) and len(puzzle_array) < 81:
-                if puzzle_string[processor].isnumeric():
-                    puzzle_array.append(puzzle_string[processor])
-                elif puzzle_string[processor] == '\n' or puzzle_string[processor] == '\r':
-                    # This was tricky. HTML form newlines aren't \n, they are \r
-                    pass
-                else:
-                    puzzle_array.append(' ')
-                processor = processor + 1
-            while len(puzzle_array) < 81:
-                puzzle_array.append(' ')
-            self.puzzle_array = puzzle_array
+            # One byte per cell: the digit, or 0 if the cell is blank.
+            canonical_puzzle = canonicalize(puzzle_string).encode('ascii')
+            self.puzzle_array = bytearray(canonical_puzzle.translate(VALUE_TABLE))
             self.puzzle_string = puzzle_string
             self.check_valid_puzzle()
             self.build_possibilities()
@@ -68,20 +169,25 @@ class SudokuSolver:
         copy_solver = SudokuSolver()
         copy_solver.puzzle_string = copy.deepcopy( self.puzzle_string )
         copy_solver.puzzle_array  = copy.deepcopy( self.puzzle_array )
-        copy_solver.possibilities = copy.deepcopy( self.get_possibilities() )
+        copy_solver.possibilities = copy.copy( self.possibilities )
+        copy_solver.total = self.total
         return copy_solver
 
     def check_valid_puzzle(self) -> None:
         """
         Checks that the puzzle created is valid. Raises ValueError if invalid.
+
+        Each box, row and column is checked in one pass, marking the bit of every digit seen.
         """
-        for i in range(0, 9):
-            if not self.check_valid_box(i):
-                raise ValueError("Invalid puzzle. Bad box.")
-            if not self.check_valid_row(i):
-                raise ValueError("Invalid puzzle. Bad row.")
-            if not self.check_valid_column(i):
-                raise ValueError("Invalid puzzle. Bad column.")
+        cells = [VALUE_BIT[value] for value in self.puzzle_array]
+        for unit_name, units in (('box', BOX_IDX), ('row', ROW_IDX), ('column', COL_IDX)):
+            for unit in units:
+                seen = 0
+                for i in unit:
+                    bit = cells[i]
+                    if seen & bit:
+                        raise ValueError(f"Invalid puzzle. Bad {unit_name}.")
+                    seen |= bit
 
     def check_valid_solution(self) -> bool:
         """
@@ -96,67 +202,6 @@ class SudokuSolver:
         except:
             return False
 
-    def check_valid_box(self, box_number) -> bool:
-        """
-        Check that a box of cells is valid under sudoku rules.
-
-        param box_number: int. The number of the box to be checked.
-
-        Returns: bool. True if valid. False in invalid.
-        """
-        # Get the index of the first cell.
-        box_start = self.get_box_start_index(box_number)
-        # Create an empty list. We'll insert each cell's contents.
-        box = []
-        box.append(self.puzzle_array[box_start])
-        box.append(self.puzzle_array[box_start + 1])
-        box.append(self.puzzle_array[box_start + 2])
-        box.append(self.puzzle_array[box_start + 9])
-        box.append(self.puzzle_array[box_start + 10])
-        box.append(self.puzzle_array[box_start + 11])
-        box.append(self.puzzle_array[box_start + 18])
-        box.append(self.puzzle_array[box_start + 19])
-        box.append(self.puzzle_array[box_start + 20])
-
-        # Check to see if any numbers are duplicated. If it is, return False.
-        for i in range(1, 10):
-            if box.count(str(i)) > 1:
-                return False
-
-        return True
-
-    def check_valid_row(self, row_number) -> bool:
-        """
-        Check to see if a row is valid under sudoku rules.
-
-        param row_number: number of row to check.
-
-        Returns: bool. True if valid, False if invalid.
-        """
-        # Get a list with all the numbers in the row.
-        row = self.puzzle_array[row_number * 9 : row_number * 9 + 9 :]
-        # If a number is duplicated return false.
-        for i in range(1, 10):
-            if row.count(str(i)) > 1:
-                return False
-        return True
-
-    def check_valid_column(self, column_number) -> bool:
-        """
-        Check if a column in the puzzle is valid.
-
-        param column_number: int. Number of column to check.
-
-        Returns: bool. True if valid. False if invalid.
-        """
-        # Make a list containing the selected column.
-        column = self.puzzle_array[column_number::9]
-        # If a number is duplicated return false.
-        for i in range(1, 10):
-            if column.count(str(i)) > 1:
-                return False
-        return True
-
     def get_cell_box_number(self, cell_number):
         raise NotImplementedError('TODO: get_cell_box_number')
 
@@ -175,21 +220,7 @@ class SudokuSolver:
 
         Returns: str. printable string in puzzle format.
         """
-        sudoku_string = ' --- --- ---\n'
-
-        for i in range(len(self.puzzle_array)):
-            if i % 27 == 0 and i != 0:
-                sudoku_string = sudoku_string + '|\n --- --- ---\n'
-            elif i % 9 == 0 and i != 0:
-                sudoku_string = sudoku_string + '|\n'
-            if i % 3 == 0:
-                sudoku_string = sudoku_string + '|'
-
-            sudoku_string = sudoku_string + self.puzzle_array[i]
-
-        sudoku_string = sudoku_string + '|\n --- --- ---'
-
-        return sudoku_string
+        return GRID_TEMPLATE.format(*(VALUE_CHARS[value] for value in self.puzzle_array))
 
     def print_possibilities(self) -> None:
         """
@@ -200,84 +231,35 @@ class SudokuSolver:
         for i in range(81):
             if i % 9 == 0 and i != 0:
                 print()
-            if len(self.possibilities[i]) == 1:
-                print(self.possibilities[i][0], end='')
+            if is_solved(self.possibilities[i]):
+                print(self.possibilities[i].bit_length(), end='')
             else:
                 print(' ', end='')
         print()
 
     def build_possibilities(self) -> None:
         """
-        Builds the possible solutions for all of the cells. If a cell is solved it continues running
-        until no more are solved during an iteration.
+        Builds the possible solutions for all of the cells. Every solved cell removes its digit from
+        its peers, and any peer that becomes solved is queued in turn, until nothing changes.
 
         Uses row, column, and box elimination, and can identify unique solutions for a number in a 
-        box.
-
-        Saves the possibilities as a class attribute.
-        """
-        self.possibilities = [[str(i) for i in range(1, 10)] for i in range(0, 81)]
-        for i in range(0, 81):
-            if self.puzzle_array[i] != ' ':
-                self.possibilities[i] = [self.puzzle_array[i]]
-
-        old_possibilities = self.number_of_possibilites()
-        new_possibilities = 0
-        while old_possibilities > new_possibilities:
-            old_possibilities = self.number_of_possibilites()
-
-            for i in range(0, 9):
-                self.reduce_row(i)
-
-            for i in range(0, 9):
-                self.reduce_column(i)
-
-            for i in range(0, 9):
-                self.reduce_box(i)
+        row, column or box. Only units with a changed cell are searched again for unique solutions.
 
-            for i in range(0, 9):
-                self.find_unique_possibilities_by_box(i)
+        The reduction itself runs in _solver.propagate if the compiled module is built, or else in
+        solver_core.propagate, which numba compiles when installed.
 
-            new_possibilities = self.number_of_possibilites()
-
-    def reduce_row(self, row_number) -> None:
-        """
-        Reduces possibilities in a row.
-
-        param row_number: the number of the row to reduce.
+        Saves the possibilities as a class attribute, one candidate mask per cell, and their count
+        as total.
         """
-        i = row_number * 9
-
-        numbers_to_eliminate = []
-
-        while i < (row_number * 9) + 9:
-            if len(self.possibilities[i]) == 1:
-                numbers_to_eliminate.append(self.possibilities[i][0])
-            i = i + 1
-
-        for number in numbers_to_eliminate:
-            i = row_number * 9
-            while i < (row_number * 9) + 9:
-                if len(self.possibilities[i]) != 1 and number in self.possibilities[i]:
-                    self.possibilities[i].pop(self.possibilities[i].index(number))
-                i = i + 1
-
-    def reduce_column(self, column_number) -> None:
-        i = column_number
-
-        numbers_to_eliminate = []
-
-        while i < 81:
-            if len(self.possibilities[i]) == 1:
-                numbers_to_eliminate.append(self.possibilities[i][0])
-            i = i + 9
+        self.possibilities = array('H', [FULL]) * 81
+        self.total = 9 * 81
+        for i in range(0, 81):
+            if self.puzzle_array[i]:
+                self.possibilities[i] = VALUE_BIT[self.puzzle_array[i]]
+                self.total -= 8
 
-        for number in numbers_to_eliminate:
-            i = column_number
-            while i < 81:
-                if len(self.possibilities[i]) != 1 and number in self.possibilities[i]:
-                    self.possibilities[i].pop(self.possibilities[i].index(number))
-                i = i + 9
+        self.total -= propagation.propagate(self.possibilities, PEERS_FLAT, UNITS_FLAT,
+                                            CELL_UNITS_FLAT)
 
     def get_box_start_index(self, box_number) -> int:
         """
@@ -287,123 +269,24 @@ class SudokuSolver:
 
         Returns: int. The index of the upper left cell in the box.
         """
-        if box_number == 0:
-            return 0
-        elif box_number == 1:
-            return 3
-        elif box_number == 2:
-            return 6
-        elif box_number == 3:
-            return 27
-        elif box_number == 4:
-            return 30
-        elif box_number == 5:
-            return 33
-        elif box_number == 6:
-            return 54
-        elif box_number == 7:
-            return 57
-        elif box_number == 8:
-            return 60
-
-    def reduce_box(self, box_number) -> None:
-        """
-        Reduces the possibilities in a box based on given or solved cells in the box.
-
-        param int box_number: the box number to be reduced.
-
-        Returns: None.
-        """
-        i = self.get_box_start_index(box_number)
-        numbers_to_eliminate = []
-
-        for j in range(0, 3):
-            if len(self.possibilities[i]) == 1:
-                numbers_to_eliminate.append(self.possibilities[i][0])
-            i = i + 1
-            if len(self.possibilities[i]) == 1:
-                numbers_to_eliminate.append(self.possibilities[i][0])
-            i = i + 1
-            if len(self.possibilities[i]) == 1:
-                numbers_to_eliminate.append(self.possibilities[i][0])
-            i = i + 7
-
-        for number in numbers_to_eliminate:
-            i = self.get_box_start_index(box_number)
-            for j in range(0, 3):
-                if len(self.possibilities[i]) != 1 and number in self.possibilities[i]:
-                    self.possibilities[i].pop(self.possibilities[i].index(number))
-                i = i + 1
-                if len(self.possibilities[i]) != 1 and number in self.possibilities[i]:
-                    self.possibilities[i].pop(self.possibilities[i].index(number))
-                i = i + 1
-                if len(self.possibilities[i]) != 1 and number in self.possibilities[i]:
-                    self.possibilities[i].pop(self.possibilities[i].index(number))
-                i = i + 7
-
-    def find_unique_possibilities_by_box(self, box_number) -> None:
-        # TODO: test this more, this one of all of them is the scariest so far
-        box_start = self.get_box_start_index(box_number)
-        all_possibilities = []
-        numbers_to_reduce = []
-        not_to_eliminate = []
-        i = box_start
-
-        for j in range(0, 3):
-            if len(self.possibilities[i]) > 1:
-                all_possibilities = all_possibilities + self.possibilities[i]
-            else:
-                not_to_eliminate.append(self.possibilities[i][0])
-            i = i + 1
-
-            if len(self.possibilities[i]) > 1:
-                all_possibilities = all_possibilities + self.possibilities[i]
-            else:
-                not_to_eliminate.append(self.possibilities[i][0])
-            i = i + 1
-
-            if len(self.possibilities[i]) > 1:
-                all_possibilities = all_possibilities + self.possibilities[i]
-            else:
-                not_to_eliminate.append(self.possibilities[i][0])
-            i = i + 7
-
-        for j in range(0, 10):
-            if all_possibilities.count(str(j)) == 1 and str(j) not in not_to_eliminate:
-                numbers_to_reduce.append(str(j))
-
-        for number in numbers_to_reduce:
-            i = box_start
-            for j in range(0, 3):
-                if len(self.possibilities[i]) > 1 and (number in self.possibilities[i]):
-                    self.possibilities[i] = [number]
-                i = i + 1
-                if len(self.possibilities[i]) > 1 and (number in self.possibilities[i]):
-                    self.possibilities[i] = [number]
-                i = i + 1
-                if len(self.possibilities[i]) > 1 and (number in self.possibilities[i]):
-                    self.possibilities[i] = [number]
-                i = i + 7
+        return BOX_START[box_number]
 
     def number_of_possibilites(self) -> int:
         """
-        Count the number of possibilities remaining in the puzzle.
+        Count the number of possibilities remaining in the puzzle. The count is kept up to date as
+        possibilities are removed, so this doesn't scan the cells.
 
         Returns: int.
         """
-        possibilities = 0
-
-        for i in range(0, 81):
-            possibilities = possibilities + len(self.possibilities[i])
-        return possibilities
+        return self.total
 
     def get_possibilities(self) -> list:
         """
         Get the remaining possibilities in a puzzle.
 
-        Returns: list (of lists). 
+        Returns: list (of lists). The candidate digits, as strings, for each cell.
         """
-        return self.possibilities
+        return [mask_to_digits(mask) for mask in self.possibilities]
 
     def get_reduced_puzzle(self) -> string:  # TODO: expand testing for this
         """
@@ -411,45 +294,25 @@ class SudokuSolver:
 
         Returns: string.
         """
-        reduced_puzzle = ''
-        for possibility in self.possibilities:
-            if len(possibility) == 1:
-                reduced_puzzle = reduced_puzzle + possibility[0]
-            else:
-                reduced_puzzle = reduced_puzzle + '.'
-        return reduced_puzzle
+        # DIGIT maps every unsolved mask to a '.'.
+        return ''.join(DIGIT[mask] for mask in self.possibilities)
     
     def get_possibilities_for_web(self) -> list:
         """
         Get the string encodings of the reduced puzzle. Returns a list of strings.
         For cells that have multiple possibilities still, it will format them so that
         the preformatting checker will leave them alone and they'll be readable.
+        The hints come from HINT_GRID, so every unsolved cell is three lines of three.
 
         Returns: list (of strings).
         """
-        def build_hints_string(remaining_hints) -> str:
-            hint_string = ''
-            index = 1
-            for letter in remaining_hints:
-                while int(letter) != index:
-                    hint_string = hint_string + ' '
-                    if index % 3 == 0:
-                        hint_string = hint_string + '\n'
-                    index += 1
-                hint_string = hint_string + letter
-                if index % 3 ==0:
-                    hint_string = hint_string + '\n'
-                index = index+1
-                
-            return hint_string
-        
         formatted_list = []
 
-        for cell in self.possibilities:
-            if len(cell) == 1:
-                formatted_list.append(cell)
+        for mask in self.possibilities:
+            if is_solved(mask):
+                formatted_list.append( DIGIT[mask] )
             else:
-                formatted_list.append( build_hints_string(cell) )
+                formatted_list.append( HINT_GRID[mask] )
 
         return formatted_list
     
@@ -459,6 +322,8 @@ class BacktrackSolver:
 
     Uses modified backtracking algorithm to find solutions to sudoku puzzles.
     """
+    __slots__ = ('puzzle_string', 'puzzle', 'solver', 'possibilities')
+
     def __init__(self, **kwargs) -> None:
         """
         Creates Backtrack solver object.
@@ -480,6 +345,20 @@ class BacktrackSolver:
         else:
             raise KeyError('Use \'puzzle = <puzzle>\' or \'solver = <solver>\'')
         
+    def solve(self) -> Optional['SudokuSolver']:
+        """
+        Solves the puzzle by guessing in the cell with the fewest possibilities and backing out of
+        any guess that leads to a contradiction.
+
+        Returns: SudokuSolver. A copy of the solver with every cell solved, or None if the puzzle
+            has no solution.
+        """
+        solution = self.solver.copy_solver()
+        if not solver_core.search(solution.possibilities, PEERS_FLAT, UNITS_FLAT, CELL_UNITS_FLAT):
+            return None
+        solution.total = 81
+        return solution
+
     def solve_by_backtrack(self):
         '''
         TODO: docstring
@@ -497,35 +376,29 @@ class BacktrackSolver:
 
             if i == 19:
                 break
-            print(i, step_solver.possibilities[i])
+            print(i, mask_to_digits(step_solver.possibilities[i]))
 
-            if len(step_solver.possibilities[i]) == 1:      # if the cell is solved, skip it
+            if is_solved(step_solver.possibilities[i]):     # if the cell is solved, skip it
                 i += 1
             else:                                           # Find an unsolved cell.
-                guesses.append((i, step_solver.possibilities[i][0]))        # Add the new guess
-                step_solver.possibilities[i] = [step_solver.possibilities[i][0]]
+                mask = step_solver.possibilities[i]
+                guesses.append((i, mask & -mask))           # Add the new guess (lowest digit)
+                step_solver.possibilities[i] = mask & -mask
 
                 good_guess = step_solver.check_valid_solution()             # See if it's a valid solution
                 if not good_guess:              # If it's not valid
                     if len( guesses ) > 0:      # check if the stack has items
-                        step_solver.possibilities[i] = copy.copy(root_solver.possibilities[i])
+                        step_solver.possibilities[i] = root_solver.possibilities[i]
                         correction = guesses.pop(-1)    # pop from stack
                         i, wrong_guess = correction[0], correction[1]
-                        for possibility in step_solver.possibilities[i]:
-                            if int(possibility) <= int(wrong_guess):
-                                step_solver.possibilities[i].remove(possibility) # remove wrong guesses
-                            else:
-                                break
+                        # remove wrong guesses (every digit up to and including the wrong one)
+                        step_solver.possibilities[i] &= ~((wrong_guess << 1) - 1)
                         # somewhere in here we need to remove ALL wrong guesses up to that point
-                        while len(step_solver.possibilities[i]) == 0:
-                            step_solver.possibilities[i] = copy.copy(root_solver.possibilities[i])
+                        while step_solver.possibilities[i] == 0:
+                            step_solver.possibilities[i] = root_solver.possibilities[i]
                             correction = guesses.pop(-1)    # pop another from stack
                             i, wrong_guess = correction[0], correction[1]
-                            for possibility in step_solver.possibilities[i]:
-                                if int(possibility) <= int(wrong_guess):
-                                    step_solver.possibilities[i].remove(possibility) # remove wrong guesses
-                                else:
-                                    break
+                            step_solver.possibilities[i] &= ~((wrong_guess << 1) - 1)
                         # try another possibility
                         # if there's not another possility 
                         # Restore possibiities
@@ -557,16 +430,17 @@ class BacktrackSolver:
         guesses = []
        
         while i < 81: 
-            print( 'i:', i, step_solver.possibilities[i])
+            print( 'i:', i, mask_to_digits(step_solver.possibilities[i]))
 
-            if (step_solver.possibilities[i]  == root_solver.possibilities[i]
-                and len(step_solver.possibilities[i]) == 1 ):
+            mask = step_solver.possibilities[i]
+            if (mask == root_solver.possibilities[i]
+                and is_solved(mask) ):
                 i += 1 # we need to make sure to not skip 9's
-            elif (i,step_solver.possibilities[i][0]) in guesses:
+            elif (i, mask & -mask) in guesses:
                 i += 1
             else:
-                guesses.append( (i,step_solver.possibilities[i][0]) )
-                step_solver.possibilities[i] = [step_solver.possibilities[i][0]]
+                guesses.append( (i, mask & -mask) )
+                step_solver.possibilities[i] = mask & -mask
 
                 valid_guess = step_solver.check_valid_solution()
 
@@ -575,19 +449,14 @@ class BacktrackSolver:
 
                     bad_guess = guesses.pop()
 
-                    print('i:', bad_guess[0], 'bad guess:', bad_guess[1])
-
-                    step_solver.possibilities[i] = copy.copy(root_solver.possibilities[i])
+                    print('i:', bad_guess[0], 'bad guess:', bad_guess[1].bit_length())
 
-                    to_remove = []
-                    for possibility in step_solver.possibilities[i]:
-                        if int(possibility) <= int(bad_guess[1]):
-                            to_remove.append(possibility)
+                    step_solver.possibilities[i] = root_solver.possibilities[i]
 
-                    for item in to_remove:
-                        step_solver.possibilities[i].remove(item)
+                    # Remove every digit up to and including the bad guess.
+                    step_solver.possibilities[i] &= ~((bad_guess[1] << 1) - 1)
 
-                    if len( step_solver.possibilities[i] ) == 0:
+                    if step_solver.possibilities[i] == 0:
                         print('here is a problem')
                         # TODO: write the logic to backtrack here!
 
@@ -0,0 +1,130 @@
+import pytest
+from array import array
+
+import solver_core
+import sudoku_solver
+
+
+def test_propagate_naked_single():
+    possibilities = array('H', [sudoku_solver.FULL]) * 81
+    for i in range(0, 8):
+        possibilities[i] = 1 << i
+    solver_core.propagate(possibilities, sudoku_solver.PEERS_FLAT, sudoku_solver.UNITS_FLAT,
+                          sudoku_solver.CELL_UNITS_FLAT)
+    assert possibilities[8] == 1 << 8
+    assert possibilities[9] == 0b111111000
+
+
+def test_propagate_unique_in_box():
+    possibilities = array('H', [sudoku_solver.FULL]) * 81
+    possibilities[1] = 1 << 0
+    possibilities[2] = 1 << 1
+    possibilities[12] = 1 << 5
+    possibilities[26] = 1 << 5
+    solver_core.propagate(possibilities, sudoku_solver.PEERS_FLAT, sudoku_solver.UNITS_FLAT,
+                          sudoku_solver.CELL_UNITS_FLAT)
+    assert possibilities[0] == 1 << 5
+
+
+def test_propagate_unique_in_row():
+    possibilities = array('H', [sudoku_solver.FULL]) * 81
+    # 9 only fits the last cell of row 0, but still fits three cells of box 2.
+    for i in range(0, 6):
+        possibilities[i] = 1 << i
+    possibilities[33] = 1 << 8
+    possibilities[52] = 1 << 8
+    solver_core.propagate(possibilities, sudoku_solver.PEERS_FLAT, sudoku_solver.UNITS_FLAT,
+                          sudoku_solver.CELL_UNITS_FLAT)
+    assert possibilities[8] == 1 << 8
+
+
+def test_propagate_naked_pair():
+    possibilities = array('H', [sudoku_solver.FULL]) * 81
+    # Cells 0 and 1 can only hold 1 or 2, so no other cell in row 0 can.
+    possibilities[0] = 0b000000011
+    possibilities[1] = 0b000000011
+    removed = solver_core.propagate(possibilities, sudoku_solver.PEERS_FLAT,
+                                    sudoku_solver.UNITS_FLAT, sudoku_solver.CELL_UNITS_FLAT)
+    # 1 and 2 leave the other 7 cells of row 0 and the other 6 cells of box 0.
+    assert removed == 2 * 7 + 2 * 6
+    assert possibilities[8] == 0b111111100
+    assert possibilities[9] == 0b111111100
+    assert possibilities[27] == sudoku_solver.FULL
+
+
+def test_propagate_naked_triple():
+    possibilities = array('H', [sudoku_solver.FULL]) * 81
+    # Cells 0, 1 and 2 hold {1,2}, {2,3} and {1,3}, so no other cell in row 0 or box 0 can hold 1-3.
+    possibilities[0] = 0b000000011
+    possibilities[1] = 0b000000110
+    possibilities[2] = 0b000000101
+    removed = solver_core.propagate(possibilities, sudoku_solver.PEERS_FLAT,
+                                    sudoku_solver.UNITS_FLAT, sudoku_solver.CELL_UNITS_FLAT)
+    # 1, 2 and 3 leave the other 6 cells of row 0 and the other 6 cells of box 0.
+    assert removed == 3 * 6 + 3 * 6
+    assert possibilities[8] == 0b111111000
+    assert possibilities[9] == 0b111111000
+    assert possibilities[27] == sudoku_solver.FULL
+
+
+def test_count_bits():
+    assert solver_core.count_bits(0) == 0
+    assert solver_core.count_bits(0b101) == 2
+    assert solver_core.count_bits(sudoku_solver.FULL) == 9
+
+
+def test_compiled_propagate_matches():
+    _solver = pytest.importorskip('_solver')
+    for puzzle_string in ['..95..4..6.........7569...114..7.......1.3.......6..595...4189.........7..4..92..',
+                          '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..']:
+        puzzle = sudoku_solver.SudokuSolver(puzzle_string = puzzle_string)
+        possibilities = array('H', [sudoku_solver.FULL]) * 81
+        for i in range(0, 81):
+            possibilities[i] = sudoku_solver.VALUE_BIT[puzzle.puzzle_array[i]] or sudoku_solver.FULL
+        compiled = array('H', possibilities)
+        removed = solver_core.propagate(possibilities, sudoku_solver.PEERS_FLAT,
+                                        sudoku_solver.UNITS_FLAT, sudoku_solver.CELL_UNITS_FLAT)
+        assert _solver.propagate(compiled, sudoku_solver.PEERS_FLAT, sudoku_solver.UNITS_FLAT,
+                                 sudoku_solver.CELL_UNITS_FLAT) == removed
+        assert compiled == possibilities
+
+
+def test_compiled_propagate_rejects_bad_tables():
+    _solver = pytest.importorskip('_solver')
+    possibilities = array('H', [sudoku_solver.FULL]) * 81
+    peers = array('h', sudoku_solver.PEERS_FLAT)
+    peers[5] = 81
+    with pytest.raises(ValueError):
+        _solver.propagate(possibilities, peers, sudoku_solver.UNITS_FLAT,
+                          sudoku_solver.CELL_UNITS_FLAT)
+    units = array('h', sudoku_solver.UNITS_FLAT)
+    units[5] = -1
+    with pytest.raises(ValueError):
+        _solver.propagate(possibilities, sudoku_solver.PEERS_FLAT, units,
+                          sudoku_solver.CELL_UNITS_FLAT)
+    cell_units = array('h', sudoku_solver.CELL_UNITS_FLAT)
+    cell_units[5] = 27
+    with pytest.raises(ValueError):
+        _solver.propagate(possibilities, sudoku_solver.PEERS_FLAT, sudoku_solver.UNITS_FLAT,
+                          cell_units)
+    assert possibilities == array('H', [sudoku_solver.FULL]) * 81
+
+
+def test_numba_compiled():
+    pytest.importorskip('numba')
+    # Same results as the plain Python path, but run through the compiled functions.
+    tables = (sudoku_solver.PEERS_FLAT, sudoku_solver.UNITS_FLAT, sudoku_solver.CELL_UNITS_FLAT)
+    puzzle_string = '..95..4..6.........7569...114..7.......1.3.......6..595...4189.........7..4..92..'
+    possibilities = array('H', [sudoku_solver.FULL if cell == '.' else 1 << (int(cell) - 1)
+                                for cell in puzzle_string])
+    solver_core.propagate(possibilities, *tables)
+    assert solver_core.propagate.signatures
+    assert ''.join('.' if mask & (mask - 1) else str(mask.bit_length()) for mask in possibilities) == (
+        '..95.746.6.....97547569.3.114.97563.9561.37.4....6.1595...4189..91..6547..4.5921.')
+    assert sum(solver_core.count_bits(mask) for mask in possibilities) == 141
+
+    assert solver_core.search(possibilities, *tables)
+    assert solver_core.search.signatures
+    solution = ''.join('.' if mask & (mask - 1) else str(mask.bit_length()) for mask in possibilities)
+    assert '.' not in solution
+    assert sudoku_solver.SudokuSolver(puzzle_string = solution).check_valid_solution()
@@ -6,25 +6,39 @@ from pathlib import Path
 def test_SudokuSolver_1():
     puzzle_string = '******************************************************************************************'
     test_puzzle = sudoku_solver.SudokuSolver( puzzle_string = puzzle_string)
-    test_array = [' ' for i in range(0, 81)]
+    test_array = bytearray(81)
     assert test_puzzle.puzzle_array == test_array
 
 def test_SudokuSolver_2():
     puzzle_string = f'''123456789\n\r
 *********'''
     test_puzzle = sudoku_solver.SudokuSolver( puzzle_string = puzzle_string)
-    test_array = [' ' for i in range(0,81)]
-    test_array[0] = '1'
-    test_array[1] = '2'
-    test_array[2] = '3'
-    test_array[3] = '4'
-    test_array[4] = '5'
-    test_array[5] = '6'
-    test_array[6] = '7'
-    test_array[7] = '8'
-    test_array[8] = '9'
+    test_array = bytearray(81)
+    test_array[0] = 1
+    test_array[1] = 2
+    test_array[2] = 3
+    test_array[3] = 4
+    test_array[4] = 5
+    test_array[5] = 6
+    test_array[6] = 7
+    test_array[7] = 8
+    test_array[8] = 9
     assert test_puzzle.puzzle_array == test_array
 
+def test_SudokuSolver_3():
+    # Zeros and other non 1-9 characters are blank cells.
+    puzzle_string = '0\r\n1\u00b2'
+    test_puzzle = sudoku_solver.SudokuSolver( puzzle_string = puzzle_string)
+    test_array = bytearray(81)
+    test_array[1] = 1
+    assert test_puzzle.puzzle_array == test_array
+
+
+def test_canonicalize():
+    assert sudoku_solver.canonicalize('12*\r\n0 9') == '12...9' + '.' * 75
+    assert sudoku_solver.canonicalize('1' * 90) == '1' * 81
+
+
 def test_str_1():
     puzzle_string = '******************************************************************************************'
     test_puzzle = sudoku_solver.SudokuSolver( puzzle_string = puzzle_string)
@@ -85,12 +99,27 @@ def test_str_3():
 # TODO: mess around with formats, newlines, etc.
 
 
+def test_index_tables():
+    assert sudoku_solver.ROW_IDX[1] == (9, 10, 11, 12, 13, 14, 15, 16, 17)
+    assert sudoku_solver.COL_IDX[2] == (2, 11, 20, 29, 38, 47, 56, 65, 74)
+    assert sudoku_solver.BOX_IDX[4] == (30, 31, 32, 39, 40, 41, 48, 49, 50)
+    assert sudoku_solver.BOX_START == (0, 3, 6, 27, 30, 33, 54, 57, 60)
+    assert len(sudoku_solver.PEERS[40]) == 20
+    assert 40 not in sudoku_solver.PEERS[40]
+    assert sudoku_solver.CELL_BOX[40] == 4
+    assert isinstance(sudoku_solver.BLANK_PUZZLE, tuple)
+    assert sudoku_solver.PEERS_FLAT.readonly
+
+
 def test_build_possibilities():
     test_puzzle_string = '12345678***********************************************************************9*'
     test_puzzle = sudoku_solver.SudokuSolver(puzzle_string = test_puzzle_string)
-    assert test_puzzle.possibilities[8] == ['9']
-    assert test_puzzle.possibilities[9] == ['4', '5', '6', '7', '8', '9']
-    assert test_puzzle.possibilities[17] == ['1', '2', '3', '4', '5', '6']
+    assert test_puzzle.get_possibilities()[8] == ['9']
+    assert test_puzzle.get_possibilities()[9] == ['4', '5', '6', '7', '8', '9']
+    assert test_puzzle.get_possibilities()[17] == ['1', '2', '3', '4', '5', '6']
+    assert test_puzzle.possibilities[8] == 1 << 8
+    assert test_puzzle.possibilities[17] == 0b000111111
+    assert test_puzzle.number_of_possibilites() == sum(len(p) for p in test_puzzle.get_possibilities())
     # TODO: test building possibilities
     # might want to break things down some more...
     # then test building numbers to be eliminated, etc.
@@ -99,13 +128,13 @@ def test_build_possibilities():
 def test_find_unique_possibilities():
     test_puzzle_string_1 = '12*******3********45*********6************************************************************'
     test_puzzle_1 = sudoku_solver.SudokuSolver(puzzle_string = test_puzzle_string_1)
-    assert test_puzzle_1.possibilities[10] == ['6']
+    assert test_puzzle_1.get_possibilities()[10] == ['6']
     test_puzzle_string_2 = '*12*********6*************6******************************************************'
     test_puzzle_2 = sudoku_solver.SudokuSolver(puzzle_string = test_puzzle_string_2)
-    assert test_puzzle_2.possibilities[0] == ['6']
+    assert test_puzzle_2.get_possibilities()[0] == ['6']
     test_puzzle_string_3 = '12**********6*************6******************************************************'
     test_puzzle_3 = sudoku_solver.SudokuSolver(puzzle_string = test_puzzle_string_3)
-    assert test_puzzle_3.possibilities[2] == ['6']
+    assert test_puzzle_3.get_possibilities()[2] == ['6']
 
 
 def test_print_possibilities():
@@ -173,6 +202,16 @@ def test_get_reduced_puzzle():
     # TODO: expand testing for this.
 
 
+def test_get_possibilities_for_web():
+    test_string = '12345678.'
+    test_puzzle = sudoku_solver.SudokuSolver(puzzle_string = test_string)
+    web_possibilities = test_puzzle.get_possibilities_for_web()
+    assert web_possibilities[8] == '9'
+    assert web_possibilities[9] == '   \n456\n789'
+    assert web_possibilities[17] == '123\n456\n   '
+    assert sudoku_solver.HINT_GRID[0b100010001] == '1  \n 5 \n  9'
+
+
 def test_check_valid_solution():
     test_string = '.234567891'
     test_puzzle = sudoku_solver.SudokuSolver(puzzle_string = test_string)
@@ -183,9 +222,28 @@ def test_check_valid_solution():
     assert test_puzzle.check_valid_solution() is True
 
 
+
+def test_backtrack_solve():
+    test_string = '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..'
+    solution = sudoku_solver.BacktrackSolver(puzzle = test_string).solve()
+    assert (
+        solution.get_reduced_puzzle()
+        == '812753649943682175675491283154237896369845721287169534521974368438526917796318452'
+    )
+    assert solution.check_valid_solution() is True
+    assert solution.number_of_possibilites() == 81
+
+    # The first cell can only be 1, but column 0 already has a 1.
+    test_string = '.23456789..................1'
+    solution = sudoku_solver.BacktrackSolver(puzzle = test_string).solve()
+    assert solution is None
+
+
 if __name__ == '__main__':
     test_SudokuSolver_1()
     test_SudokuSolver_2()
+    test_SudokuSolver_3()
+    test_canonicalize()
     test_str_1()
     test_str_2()
     test_str_3()
@@ -194,4 +252,6 @@ if __name__ == '__main__':
     # test_print_possibilities()
     test_check_valid_puzzle()
     test_get_reduced_puzzle()
+    test_get_possibilities_for_web()
     # test_check_valid_solution()
+    test_backtrack_solve()